@@ -4,6 +4,7 @@ from collections.abc import Sequence
 
 import async_timeout
 from thriftpy2.thrift import TMessageType
+from thriftpy2.thrift import TType
 
 from .protocol import TBinaryProtocol, TFramedTransport
 from .util import args2kwargs
@@ -18,6 +19,7 @@ async def create_connection(
     protocol_cls=TBinaryProtocol,
     timeout=None,
     framed=False,
+    pipelined=False,
     **kw,
 ):
     """Create a thrift connection.
@@ -33,6 +35,11 @@ async def create_connection(
         eatablishd within `timeout`, if timeout is a tuple of two number,
         each number is corresponding to tcp connection timeout and read timeout of each
         rpc call.
+    :param framed: use TFramedTransport, default is False
+    :param pipelined: if True, many coroutines may call apis on the connection at
+        the same time, their requests are sent right away and replies are matched
+        to the callers by sequence id. A timed out call doesn't close a pipelined
+        connection.
     :param kw: params related to asyncio.open_connection()
     :return: newly created :class:`ThriftConnection` instance.
     """
@@ -60,7 +67,12 @@ async def create_connection(
     oprotocol = protocol_cls(writer)
 
     return ThriftConnection(
-        service, iprot=iprotocol, oprot=oprotocol, address=address, timeout=read_timeout
+        service,
+        iprot=iprotocol,
+        oprot=oprotocol,
+        address=address,
+        timeout=read_timeout,
+        pipelined=pipelined,
     )
 
 
@@ -69,16 +81,23 @@ class ThriftConnection:
     Thrift Connection.
     """
 
-    def __init__(self, service, *, iprot, oprot, address, timeout=None):
+    def __init__(
+        self, service, *, iprot, oprot, address, timeout=None, pipelined=False
+    ):
         self.service = service
         self._reader = iprot.trans
         self._writer = oprot.trans
         self.timeout = timeout
         self.address = address
         self.closed = False
+        self.pipelined = pipelined
         self._oprot = oprot
         self._iprot = iprot
         self._seqid = 0
+        # seqid -> (api, future) of the calls waiting for a reply, pipelined only
+        self._waiters = {}
+        self._reader_task = None
+        self._write_lock = asyncio.Lock() if pipelined else None
         self._init_rpc_apis()
 
     def _init_rpc_apis(self):
@@ -124,20 +143,23 @@ class ThriftConnection:
                 )
                 kwargs.update(kw)
                 result_cls = getattr(self.service, api + "_result")
-
-                self._seqid += 1
-                self._oprot.write_message_begin(api, TMessageType.CALL, self._seqid)
                 args = getattr(self.service, api + "_args")()
                 for k, v in kwargs.items():
                     setattr(args, k, v)
-                args.write(self._oprot)
-                self._oprot.write_message_end()
+
+                if self.pipelined:
+                    return await self._execute_pipelined(api, args, result_cls)
+
+                self._seqid = self._next_seqid()
+                self._send(api, args, self._seqid)
                 await self._oprot.trans.drain()
                 if not getattr(result_cls, "oneway"):
                     result = await self._recv(api)
                     return result
         except asyncio.TimeoutError:
-            self.close()
+            # other calls may still get their replies on a pipelined connection
+            if not self.pipelined:
+                self.close()
             raise
         except ConnectionError as e:
             self.close()
@@ -147,6 +169,74 @@ class ThriftConnection:
             self.close()
             raise ConnectionClosedError("Server connection has closed") from e
 
+    def _next_seqid(self):
+        # seqid is an i32 on the wire
+        return self._seqid % 0x7FFFFFFF + 1
+
+    def _send(self, api, args, seqid):
+        self._oprot.write_message_begin(api, TMessageType.CALL, seqid)
+        args.write(self._oprot)
+        self._oprot.write_message_end()
+
+    async def _execute_pipelined(self, api, args, result_cls):
+        if self._reader_task is None:
+            self._reader_task = asyncio.create_task(self._read_replies())
+
+        self._seqid = seqid = self._next_seqid()
+        future = None
+        if not getattr(result_cls, "oneway"):
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[seqid] = (api, future)
+        try:
+            # drain one request at a time, a framed transport sends everything
+            # written before it drains as a single frame.
+            async with self._write_lock:
+                self._send(api, args, seqid)
+                await self._oprot.trans.drain()
+            if future is not None:
+                return await future
+        finally:
+            self._waiters.pop(seqid, None)
+
+    async def _read_replies(self):
+        """
+        Read replies from the server for a pipelined connection and pass them on
+        to the waiting calls, until the connection is closed.
+        """
+        exc = None
+        try:
+            while True:
+                fname, mtype, rseqid = await self._iprot.read_message_begin()
+                waiter = self._waiters.pop(rseqid, None)
+                if waiter is None:
+                    # the caller has timed out or was cancelled
+                    await self._iprot.skip(TType.STRUCT)
+                    await self._iprot.read_message_end()
+                    continue
+
+                api, future = waiter
+                reply = await self._read_reply(api, mtype)
+                if future.done():
+                    continue
+                try:
+                    future.set_result(self._unpack_reply(reply))
+                except Exception as e:
+                    future.set_exception(e)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            exc = e
+            logger.debug("stop reading replies from {}: {!r}".format(self.address, e))
+        finally:
+            self._writer.close()
+            self.closed = True
+            waiters, self._waiters = self._waiters, {}
+            for api, future in waiters.values():
+                if not future.done():
+                    err = ConnectionClosedError("Server connection has closed")
+                    err.__cause__ = exc
+                    future.set_exception(err)
+
     async def _recv(self, api):
         """
         A :ref:`coroutine <coroutine>` which receive response from the thrift server
@@ -160,14 +250,28 @@ class ThriftConnection:
                 fname + " failed: out of sequence response",
             )
 
+        reply = await self._read_reply(api, mtype)
+        return self._unpack_reply(reply)
+
+    async def _read_reply(self, api, mtype):
+        """
+        Read the body of a reply message, return the result struct of `api`, or
+        the :class:`ThriftAppError` sent by the server.
+        """
         if mtype == TMessageType.EXCEPTION:
             x = ThriftAppError()
             await self._iprot.read_struct(x)
             await self._iprot.read_message_end()
-            raise x
+            return x
         result = getattr(self.service, api + "_result")()
         await self._iprot.read_struct(result)
         await self._iprot.read_message_end()
+        return result
+
+    def _unpack_reply(self, result):
+        """Return the value of a reply read by :meth:`_read_reply`, or raise its error."""
+        if isinstance(result, ThriftAppError):
+            raise result
 
         if hasattr(result, "success") and result.success is not None:
             return result.success
@@ -186,3 +290,10 @@ class ThriftConnection:
     def close(self):
         self._writer.close()
         self.closed = True
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+
+    async def wait_closed(self):
+        """Wait until the reply reader of a pipelined connection has stopped."""
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
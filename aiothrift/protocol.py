@@ -1,7 +1,7 @@
+import asyncio
 import struct
 
 from io import BytesIO
-from struct import pack, unpack
 from thriftpy2.protocol.exc import TProtocolException
 from thriftpy2.thrift import TType
 
@@ -9,64 +9,101 @@ VERSION_MASK = -65536
 VERSION_1 = -2147418112
 TYPE_MASK = 0x000000FF
 
+_i8 = struct.Struct("!b")
+_i16 = struct.Struct("!h")
+_i32 = struct.Struct("!i")
+_i64 = struct.Struct("!q")
+_double = struct.Struct("!d")
+_field_header = struct.Struct("!bh")
+_list_header = struct.Struct("!bi")
+_map_header = struct.Struct("!bbi")
+
+# wire size of the fixed width types, used when skipping over values
+_FIXED_SIZES = {
+    TType.BOOL: 1,
+    TType.BYTE: 1,
+    TType.I16: 2,
+    TType.I32: 4,
+    TType.I64: 8,
+    TType.DOUBLE: 8,
+}
+
+
+class BufferUnderflow(Exception):
+    """Raised by the buffer decoders when the data ends in the middle of a value."""
+
+
+# what the buffer decoders may raise when running out of data
+_UNDERFLOW_ERRORS = (BufferUnderflow, struct.error, IndexError)
+
 
 def pack_i8(byte):
-    return struct.pack("!b", byte)
+    return _i8.pack(byte)
 
 
 def pack_i16(i16):
-    return struct.pack("!h", i16)
+    return _i16.pack(i16)
 
 
 def pack_i32(i32):
-    return struct.pack("!i", i32)
+    return _i32.pack(i32)
 
 
 def pack_i64(i64):
-    return struct.pack("!q", i64)
+    return _i64.pack(i64)
 
 
 def pack_double(dub):
-    return struct.pack("!d", dub)
+    return _double.pack(dub)
 
 
 def pack_string(string):
-    return struct.pack("!i%ds" % len(string), len(string), string)
+    return _i32.pack(len(string)) + string
 
 
 def unpack_i8(buffer):
-    return struct.unpack("!b", buffer)[0]
+    return _i8.unpack(buffer)[0]
 
 
 def unpack_i16(buffer):
-    return struct.unpack("!h", buffer)[0]
+    return _i16.unpack(buffer)[0]
 
 
 def unpack_i32(buffer):
-    return struct.unpack("!i", buffer)[0]
+    return _i32.unpack(buffer)[0]
 
 
 def unpack_i64(buffer):
-    return struct.unpack("!q", buffer)[0]
+    return _i64.unpack(buffer)[0]
 
 
 def unpack_double(buffer):
-    return struct.unpack("!d", buffer)[0]
+    return _double.unpack(buffer)[0]
 
 
-def write_message_begin(writer, name, ttype, seqid, strict=True):
+def pack_message_begin(name, ttype, seqid, strict=True):
+    """Return a new bytearray holding the message header, ready to be extended
+    with the message body.
+    """
+    name = name.encode("utf-8")
+    size = len(name)
     if strict:
-        writer.write(pack_i32(VERSION_1 | ttype))
-        writer.write(pack_string(name.encode("utf-8")))
+        fmt = "!ii%dsi" % size
+        header = bytearray(struct.calcsize(fmt))
+        struct.pack_into(fmt, header, 0, VERSION_1 | ttype, size, name, seqid)
     else:
-        writer.write(pack_string(name.encode("utf-8")))
-        writer.write(pack_i8(ttype))
+        fmt = "!i%dsbi" % size
+        header = bytearray(struct.calcsize(fmt))
+        struct.pack_into(fmt, header, 0, size, name, ttype, seqid)
+    return header
+
 
-    writer.write(pack_i32(seqid))
+def write_message_begin(writer, name, ttype, seqid, strict=True):
+    writer.write(pack_message_begin(name, ttype, seqid, strict))
 
 
 def write_field_begin(writer, ttype, fid):
-    writer.write(pack_i8(ttype) + pack_i16(fid))
+    writer.write(_field_header.pack(ttype, fid))
 
 
 def write_field_stop(writer):
@@ -74,11 +111,11 @@ def write_field_stop(writer):
 
 
 def write_list_begin(writer, etype, size):
-    writer.write(pack_i8(etype) + pack_i32(size))
+    writer.write(_list_header.pack(etype, size))
 
 
 def write_map_begin(writer, ktype, vtype, size):
-    writer.write(pack_i8(ktype) + pack_i8(vtype) + pack_i32(size))
+    writer.write(_map_header.pack(ktype, vtype, size))
 
 
 def write_val(writer, ttype, val, spec=None):
@@ -103,7 +140,7 @@ def write_val(writer, ttype, val, spec=None):
     elif ttype == TType.DOUBLE:
         writer.write(pack_double(val))
 
-    elif ttype == TType.STRING:
+    elif ttype == TType.STRING or ttype == BINARY:
         if not isinstance(val, bytes):
             val = val.encode("utf-8")
         writer.write(pack_string(val))
@@ -115,7 +152,7 @@ def write_val(writer, ttype, val, spec=None):
             e_type, t_spec = spec, None
 
         val_len = len(val)
-        write_list_begin(writer, e_type, val_len)
+        write_list_begin(writer, _wire_type(e_type), val_len)
         for e_val in val:
             write_val(writer, e_type, e_val, t_spec)
 
@@ -132,7 +169,7 @@ def write_val(writer, ttype, val, spec=None):
         else:
             v_type, v_spec = spec[1]
 
-        write_map_begin(writer, k_type, v_type, len(val))
+        write_map_begin(writer, _wire_type(k_type), _wire_type(v_type), len(val))
         for k in iter(val):
             write_val(writer, k_type, k, k_spec)
             write_val(writer, v_type, val[k], v_spec)
@@ -150,7 +187,7 @@ def write_val(writer, ttype, val, spec=None):
             if v is None:
                 continue
 
-            write_field_begin(writer, f_type, fid)
+            write_field_begin(writer, _wire_type(f_type), fid)
             write_val(writer, f_type, v, f_container_spec)
         write_field_stop(writer)
 
@@ -241,14 +278,14 @@ async def read_val(reader, ttype, spec=None, decode_response=True):
         data = await reader.readexactly(8)
         return unpack_double(data)
 
-    elif ttype == TType.STRING:
+    elif ttype == TType.STRING or ttype == BINARY:
         data = await reader.readexactly(4)
         sz = unpack_i32(data)
         byte_payload = await reader.readexactly(sz)
 
         # Since we cannot tell if we're getting STRING or BINARY
         # if not asked not to decode, try both
-        if decode_response:
+        if decode_response and ttype != BINARY:
             try:
                 return byte_payload.decode("utf-8")
             except UnicodeDecodeError:
@@ -264,7 +301,7 @@ async def read_val(reader, ttype, spec=None, decode_response=True):
         result = []
         r_type, sz = await read_list_begin(reader)
         # the v_type is useless here since we already get it from spec
-        if r_type != v_type:
+        if r_type != _wire_type(v_type):
             for _ in range(sz):
                 await skip(reader, r_type)
             return []
@@ -289,7 +326,7 @@ async def read_val(reader, ttype, spec=None, decode_response=True):
 
         result = {}
         sk_type, sv_type, sz = await read_map_begin(reader)
-        if sk_type != k_type or sv_type != v_type:
+        if sk_type != _wire_type(k_type) or sv_type != _wire_type(v_type):
             for _ in range(sz):
                 await skip(reader, sk_type)
                 await skip(reader, sv_type)
@@ -309,28 +346,25 @@ async def read_val(reader, ttype, spec=None, decode_response=True):
 
 
 async def read_struct(reader, obj, decode_response=True):
+    fields = get_codec(obj.__class__).fields
     while True:
         f_type, fid = await read_field_begin(reader)
         if f_type == TType.STOP:
             break
 
-        if fid not in obj.thrift_spec:
+        if fid not in fields:
             await skip(reader, f_type)
             continue
 
-        if len(obj.thrift_spec[fid]) == 3:
-            sf_type, f_name, f_req = obj.thrift_spec[fid]
-            f_container_spec = None
-        else:
-            sf_type, f_name, f_container_spec, f_req = obj.thrift_spec[fid]
+        sf_type, f_name, f_container_spec = fields[fid]
 
         # it really should equal here. but since we already wasted
         # space storing the duplicate info, let's check it.
-        if f_type != sf_type:
+        if f_type != _wire_type(sf_type):
             await skip(reader, f_type)
             continue
 
-        data = await read_val(reader, f_type, f_container_spec, decode_response)
+        data = await read_val(reader, sf_type, f_container_spec, decode_response)
         setattr(obj, f_name, data)
 
 
@@ -351,7 +385,7 @@ async def skip(reader, ftype):
         await reader.readexactly(8)
 
     elif ftype == TType.STRING:
-        await reader.readexactly(unpack_i32(reader.readexactly(4)))
+        await reader.readexactly(unpack_i32(await reader.readexactly(4)))
 
     elif ftype == TType.SET or ftype == TType.LIST:
         v_type, sz = await read_list_begin(reader)
@@ -359,7 +393,7 @@ async def skip(reader, ftype):
             await skip(reader, v_type)
 
     elif ftype == TType.MAP:
-        k_type, v_type, sz = read_map_begin(reader)
+        k_type, v_type, sz = await read_map_begin(reader)
         for i in range(sz):
             await skip(reader, k_type)
             await skip(reader, v_type)
@@ -372,6 +406,545 @@ async def skip(reader, ftype):
             await skip(reader, f_type)
 
 
+def decode_message_begin(buf, pos, strict=True):
+    """Synchronous counterpart of :func:`read_message_begin` working on ``buf``.
+
+    Returns ``(name, type, seqid)`` and the offset following the header.
+    """
+    (sz,) = _i32.unpack_from(buf, pos)
+    pos += 4
+    if sz < 0:
+        version = sz & VERSION_MASK
+        if version != VERSION_1:
+            raise TProtocolException(
+                type=TProtocolException.BAD_VERSION,
+                message="Bad version in read_message_begin: %d" % (sz),
+            )
+        (name_sz,) = _i32.unpack_from(buf, pos)
+        pos += 4
+        type_ = sz & TYPE_MASK
+    else:
+        if strict:
+            raise TProtocolException(
+                type=TProtocolException.BAD_VERSION,
+                message="No protocol version header",
+            )
+        name_sz = sz
+        type_ = None
+
+    end = pos + name_sz
+    if end > len(buf):
+        raise BufferUnderflow
+    name = str(buf[pos:end], "utf-8")
+    pos = end
+    if type_ is None:
+        (type_,) = _i8.unpack_from(buf, pos)
+        pos += 1
+
+    (seqid,) = _i32.unpack_from(buf, pos)
+    return (name, type_, seqid), pos + 4
+
+
+def decode_val(buf, pos, ttype, spec=None, decode_response=True):
+    """Synchronous counterpart of :func:`read_val` working on ``buf``.
+
+    Returns the decoded value and the offset following it. Raises
+    :class:`struct.error` or :class:`BufferUnderflow` if ``buf`` ends early.
+    """
+    if ttype == TType.BOOL:
+        return bool(_i8.unpack_from(buf, pos)[0]), pos + 1
+
+    elif ttype == TType.BYTE:
+        return _i8.unpack_from(buf, pos)[0], pos + 1
+
+    elif ttype == TType.I16:
+        return _i16.unpack_from(buf, pos)[0], pos + 2
+
+    elif ttype == TType.I32:
+        return _i32.unpack_from(buf, pos)[0], pos + 4
+
+    elif ttype == TType.I64:
+        return _i64.unpack_from(buf, pos)[0], pos + 8
+
+    elif ttype == TType.DOUBLE:
+        return _double.unpack_from(buf, pos)[0], pos + 8
+
+    elif ttype == TType.STRING or ttype == BINARY:
+        (sz,) = _i32.unpack_from(buf, pos)
+        pos += 4
+        end = pos + sz
+        if end > len(buf):
+            raise BufferUnderflow
+        byte_payload = buf[pos:end]
+        if decode_response and ttype != BINARY:
+            try:
+                return str(byte_payload, "utf-8"), end
+            except UnicodeDecodeError:
+                pass
+        return bytes(byte_payload), end
+
+    elif ttype == TType.SET or ttype == TType.LIST:
+        if isinstance(spec, tuple):
+            v_type, v_spec = spec[0], spec[1]
+        else:
+            v_type, v_spec = spec, None
+
+        r_type, sz = _list_header.unpack_from(buf, pos)
+        pos += 5
+        if r_type != _wire_type(v_type):
+            for _ in range(sz):
+                pos = skip_val(buf, pos, r_type)
+            return [], pos
+
+        result = []
+        for _ in range(sz):
+            data, pos = decode_val(buf, pos, v_type, v_spec, decode_response)
+            result.append(data)
+        return result, pos
+
+    elif ttype == TType.MAP:
+        if isinstance(spec[0], int):
+            k_type = spec[0]
+            k_spec = None
+        else:
+            k_type, k_spec = spec[0]
+
+        if isinstance(spec[1], int):
+            v_type = spec[1]
+            v_spec = None
+        else:
+            v_type, v_spec = spec[1]
+
+        sk_type, sv_type, sz = _map_header.unpack_from(buf, pos)
+        pos += 6
+        if sk_type != _wire_type(k_type) or sv_type != _wire_type(v_type):
+            for _ in range(sz):
+                pos = skip_val(buf, pos, sk_type)
+                pos = skip_val(buf, pos, sv_type)
+            return {}, pos
+
+        result = {}
+        for _ in range(sz):
+            k_val, pos = decode_val(buf, pos, k_type, k_spec, decode_response)
+            v_val, pos = decode_val(buf, pos, v_type, v_spec, decode_response)
+            result[k_val] = v_val
+        return result, pos
+
+    elif ttype == TType.STRUCT:
+        obj = spec()
+        pos = decode_struct(buf, pos, obj, decode_response)
+        return obj, pos
+
+    raise TProtocolException(
+        type=TProtocolException.INVALID_DATA, message="Unexpected type %r" % ttype
+    )
+
+
+def decode_struct(buf, pos, obj, decode_response=True):
+    """Synchronous counterpart of :func:`read_struct` working on ``buf``.
+
+    Returns the offset following the struct.
+    """
+    return get_codec(obj.__class__).decode(buf, pos, obj, decode_response)
+
+
+def skip_val(buf, pos, ttype):
+    """Return the offset following the value of type ``ttype`` starting at ``pos``."""
+    size = _FIXED_SIZES.get(ttype)
+    if size is not None:
+        pos += size
+
+    elif ttype == TType.STRING:
+        pos += 4 + _i32.unpack_from(buf, pos)[0]
+
+    elif ttype == TType.SET or ttype == TType.LIST:
+        v_type, sz = _list_header.unpack_from(buf, pos)
+        pos += 5
+        for _ in range(sz):
+            pos = skip_val(buf, pos, v_type)
+
+    elif ttype == TType.MAP:
+        k_type, v_type, sz = _map_header.unpack_from(buf, pos)
+        pos += 6
+        for _ in range(sz):
+            pos = skip_val(buf, pos, k_type)
+            pos = skip_val(buf, pos, v_type)
+
+    elif ttype == TType.STRUCT:
+        while True:
+            (f_type,) = _i8.unpack_from(buf, pos)
+            if f_type == TType.STOP:
+                return pos + 1
+            pos = skip_val(buf, pos + 3, f_type)
+
+    else:
+        raise TProtocolException(
+            type=TProtocolException.INVALID_DATA, message="Unexpected type %r" % ttype
+        )
+
+    if pos > len(buf):
+        raise BufferUnderflow
+    return pos
+
+
+def _check_size(sz):
+    if sz < 0:
+        raise TProtocolException(
+            type=TProtocolException.NEGATIVE_SIZE, message="Negative container size"
+        )
+
+
+class ValueScanner:
+    """Incrementally find the end of a binary encoded value in a growing buffer.
+
+    Unlike :func:`skip_val`, progress is kept between calls to :meth:`scan`, so
+    a value which arrives in many chunks is only walked over once.
+    """
+
+    def __init__(self, pos, ttype=TType.STRUCT):
+        self.pos = pos
+        # each frame is [container type, element types, remaining elements]
+        self._stack = []
+        self._pending = ttype
+
+    def scan(self, buf):
+        """Advance over ``buf``, return True once the whole value is in it."""
+        n = len(buf)
+        pos = self.pos
+        stack = self._stack
+        ttype = self._pending
+
+        while True:
+            if ttype is None:
+                if not stack:
+                    break
+                frame = stack[-1]
+                if frame[0] == TType.STRUCT:
+                    if pos + 1 > n:
+                        break
+                    f_type = buf[pos]
+                    if f_type == TType.STOP:
+                        pos += 1
+                        stack.pop()
+                        continue
+                    if pos + 3 > n:
+                        break
+                    pos += 3
+                    ttype = f_type
+                elif frame[2]:
+                    ttype = frame[1][frame[2] % len(frame[1])]
+                    frame[2] -= 1
+                else:
+                    stack.pop()
+                    continue
+
+            size = _FIXED_SIZES.get(ttype)
+            if size is not None:
+                if pos + size > n:
+                    break
+                pos += size
+            elif ttype == TType.STRING:
+                if pos + 4 > n:
+                    break
+                end = pos + 4 + _i32.unpack_from(buf, pos)[0]
+                if end > n:
+                    break
+                pos = end
+            elif ttype == TType.STRUCT:
+                stack.append([TType.STRUCT, None, 0])
+            elif ttype == TType.SET or ttype == TType.LIST:
+                if pos + 5 > n:
+                    break
+                e_type, sz = _list_header.unpack_from(buf, pos)
+                _check_size(sz)
+                stack.append([ttype, (e_type,), sz])
+                pos += 5
+            elif ttype == TType.MAP:
+                if pos + 6 > n:
+                    break
+                # elements alternate key, value counting down from 2 * size
+                k_type, v_type, sz = _map_header.unpack_from(buf, pos)
+                _check_size(sz)
+                stack.append([ttype, (k_type, v_type), 2 * sz])
+                pos += 6
+            else:
+                raise TProtocolException(
+                    type=TProtocolException.INVALID_DATA,
+                    message="Unexpected type %r" % ttype,
+                )
+            ttype = None
+
+        self.pos = pos
+        self._pending = ttype
+        return ttype is None and not stack
+
+
+# TType.BINARY only exists in recent thriftpy2, it shares the wire format of STRING
+BINARY = getattr(TType, "BINARY", None)
+
+# struct format codes of fixed width list elements, decoded in one go
+_ARRAY_CODES = {TType.I16: "h", TType.I32: "i", TType.I64: "q", TType.DOUBLE: "d"}
+
+_codecs = {}
+
+
+def get_codec(cls):
+    """Return the :class:`StructCodec` of thrift struct class `cls`.
+
+    The codec is compiled the first time a class is seen and cached afterwards.
+    """
+    try:
+        return _codecs[cls]
+    except KeyError:
+        codec = _codecs[cls] = StructCodec(cls)
+        return codec
+
+
+class StructCodec:
+    """Encoding and decoding plan compiled from the `thrift_spec` of a struct class.
+
+    Field headers are packed once, and each field gets a handler specialized
+    for its type, so encoding or decoding a struct doesn't inspect the spec.
+    """
+
+    def __init__(self, cls):
+        self.cls = cls
+        #: fid -> (ttype, name, container spec), as normalized thrift_spec
+        self.fields = {}
+        self._encoders = []
+        self._decoders = {}
+        for fid, f_spec in cls.thrift_spec.items():
+            if len(f_spec) == 3:
+                f_type, f_name, f_req = f_spec
+                f_container_spec = None
+            else:
+                f_type, f_name, f_container_spec, f_req = f_spec
+            self.fields[fid] = (f_type, f_name, f_container_spec)
+
+            header = _field_header.pack(_wire_type(f_type), fid)
+            self._encoders.append(
+                (f_name, header, _compile_encoder(f_type, f_container_spec))
+            )
+            self._decoders[fid] = (
+                _wire_type(f_type),
+                f_name,
+                _compile_decoder(f_type, f_container_spec),
+            )
+
+    def encode(self, out, obj):
+        """Append the binary encoding of `obj` to bytearray `out`."""
+        for f_name, header, encode in self._encoders:
+            v = getattr(obj, f_name)
+            if v is None:
+                continue
+            out += header
+            encode(out, v)
+        out.append(TType.STOP)
+
+    def decode(self, buf, pos, obj, decode_response=True):
+        """Decode the fields of `obj` from `buf` at `pos`, return the end offset.
+
+        Raises :class:`BufferUnderflow` (or :class:`struct.error`, :class:`IndexError`)
+        if `buf` ends early.
+        """
+        decoders = self._decoders
+        unpack_fid = _i16.unpack_from
+        while True:
+            f_type = buf[pos]
+            if f_type == TType.STOP:
+                return pos + 1
+
+            (fid,) = unpack_fid(buf, pos + 1)
+            pos += 3
+            field = decoders.get(fid)
+            # unknown field or a type we don't expect
+            if field is None or field[0] != f_type:
+                pos = skip_val(buf, pos, f_type)
+                continue
+
+            data, pos = field[2](buf, pos, decode_response)
+            setattr(obj, field[1], data)
+
+
+def _wire_type(ttype):
+    return TType.STRING if ttype == BINARY else ttype
+
+
+def _split_spec(spec):
+    if isinstance(spec, tuple):
+        return spec[0], spec[1]
+    return spec, None
+
+
+def _compile_encoder(ttype, spec):
+    """Return a ``encode(out, val)`` function appending `val` to bytearray `out`."""
+    if ttype == TType.BOOL:
+
+        def encode(out, val):
+            out.append(1 if val else 0)
+
+    elif ttype in _FIXED_SIZES:
+        pack = {
+            TType.BYTE: _i8,
+            TType.I16: _i16,
+            TType.I32: _i32,
+            TType.I64: _i64,
+            TType.DOUBLE: _double,
+        }[ttype].pack
+
+        def encode(out, val):
+            out += pack(val)
+
+    elif ttype == TType.STRING or ttype == BINARY:
+        pack_len = _i32.pack
+
+        def encode(out, val):
+            if not isinstance(val, bytes):
+                val = val.encode("utf-8")
+            out += pack_len(len(val))
+            out += val
+
+    elif ttype == TType.SET or ttype == TType.LIST:
+        e_type, e_spec = _split_spec(spec)
+        encode_elem = _compile_encoder(e_type, e_spec)
+        pack_header = _list_header.pack
+        e_type = _wire_type(e_type)
+
+        def encode(out, val):
+            out += pack_header(e_type, len(val))
+            for e_val in val:
+                encode_elem(out, e_val)
+
+    elif ttype == TType.MAP:
+        k_type, k_spec = _split_spec(spec[0])
+        v_type, v_spec = _split_spec(spec[1])
+        encode_key = _compile_encoder(k_type, k_spec)
+        encode_value = _compile_encoder(v_type, v_spec)
+        pack_header = _map_header.pack
+        k_type, v_type = _wire_type(k_type), _wire_type(v_type)
+
+        def encode(out, val):
+            out += pack_header(k_type, v_type, len(val))
+            for k, v in val.items():
+                encode_key(out, k)
+                encode_value(out, v)
+
+    elif ttype == TType.STRUCT:
+
+        def encode(out, val):
+            get_codec(val.__class__).encode(out, val)
+
+    else:
+        raise TProtocolException(
+            type=TProtocolException.INVALID_DATA, message="Unexpected type %r" % ttype
+        )
+
+    return encode
+
+
+def _compile_decoder(ttype, spec):
+    """Return a ``decode(buf, pos, decode_response)`` function returning the value
+    at `pos` and the offset following it.
+    """
+    if ttype == TType.BOOL:
+
+        def decode(buf, pos, decode_response):
+            return bool(_i8.unpack_from(buf, pos)[0]), pos + 1
+
+    elif ttype in _FIXED_SIZES:
+        unpack_from = {
+            TType.BYTE: _i8,
+            TType.I16: _i16,
+            TType.I32: _i32,
+            TType.I64: _i64,
+            TType.DOUBLE: _double,
+        }[ttype].unpack_from
+        size = _FIXED_SIZES[ttype]
+
+        def decode(buf, pos, decode_response):
+            return unpack_from(buf, pos)[0], pos + size
+
+    elif ttype == TType.STRING or ttype == BINARY:
+        # binary fields are never decoded to str
+        binary = ttype == BINARY
+
+        def decode(buf, pos, decode_response):
+            (sz,) = _i32.unpack_from(buf, pos)
+            pos += 4
+            end = pos + sz
+            if end > len(buf):
+                raise BufferUnderflow
+            if decode_response and not binary:
+                try:
+                    return str(buf[pos:end], "utf-8"), end
+                except UnicodeDecodeError:
+                    pass
+            return bytes(buf[pos:end]), end
+
+    elif ttype == TType.SET or ttype == TType.LIST:
+        e_type, e_spec = _split_spec(spec)
+        decode_elem = _compile_decoder(e_type, e_spec)
+        code = _ARRAY_CODES.get(e_type)
+        e_type = _wire_type(e_type)
+
+        def decode(buf, pos, decode_response):
+            r_type, sz = _list_header.unpack_from(buf, pos)
+            pos += 5
+            if r_type != e_type:
+                for _ in range(sz):
+                    pos = skip_val(buf, pos, r_type)
+                return [], pos
+
+            if code is not None and sz > 0:
+                data = struct.unpack_from("!%d%s" % (sz, code), buf, pos)
+                return list(data), pos + sz * _FIXED_SIZES[e_type]
+
+            result = []
+            append = result.append
+            for _ in range(sz):
+                data, pos = decode_elem(buf, pos, decode_response)
+                append(data)
+            return result, pos
+
+    elif ttype == TType.MAP:
+        k_type, k_spec = _split_spec(spec[0])
+        v_type, v_spec = _split_spec(spec[1])
+        decode_key = _compile_decoder(k_type, k_spec)
+        decode_value = _compile_decoder(v_type, v_spec)
+        k_type, v_type = _wire_type(k_type), _wire_type(v_type)
+
+        def decode(buf, pos, decode_response):
+            sk_type, sv_type, sz = _map_header.unpack_from(buf, pos)
+            pos += 6
+            if sk_type != k_type or sv_type != v_type:
+                for _ in range(sz):
+                    pos = skip_val(buf, pos, sk_type)
+                    pos = skip_val(buf, pos, sv_type)
+                return {}, pos
+
+            result = {}
+            for _ in range(sz):
+                k_val, pos = decode_key(buf, pos, decode_response)
+                v_val, pos = decode_value(buf, pos, decode_response)
+                result[k_val] = v_val
+            return result, pos
+
+    elif ttype == TType.STRUCT:
+        cls = spec
+
+        def decode(buf, pos, decode_response):
+            obj = cls()
+            pos = get_codec(cls).decode(buf, pos, obj, decode_response)
+            return obj, pos
+
+    else:
+        raise TProtocolException(
+            type=TProtocolException.INVALID_DATA, message="Unexpected type %r" % ttype
+        )
+
+    return decode
+
+
 class TFramedTransport:
     """Implement the Twisted framed transport protocol.
 
@@ -384,14 +957,19 @@ class TFramedTransport:
         self.__read_buffer = BytesIO()
         self.__write_buffer = BytesIO()
 
-    def read(self, n=-1):
-        if len(self.__read_buffer.getvalue()) == 0:
-            self.read_frame()
-        return self.__read_buffer.read(n)
+    async def read(self, n=-1):
+        """Read up to `n` bytes of the current frame, or all the rest of it if `n`
+        is negative. The next frame is read in once the current one is exhausted.
+        """
+        data = self.__read_buffer.read(n)
+        while not data:
+            await self.read_frame()
+            data = self.__read_buffer.read(n)
+        return data
 
     async def read_frame(self):
         buff = await self.__base.readexactly(4)
-        (sz,) = unpack("!i", buff)
+        (sz,) = _i32.unpack(buff)
         self.__read_buffer = BytesIO(await self.__base.readexactly(sz))
 
     async def readexactly(self, n):
@@ -413,7 +991,7 @@ class TFramedTransport:
         wout = self.__write_buffer.getvalue()
         wsz = len(wout)
         self.__write_buffer = BytesIO()
-        buf = pack("!i", wsz) + wout
+        buf = _i32.pack(wsz) + wout
         self.__base.write(buf)
         await self.__base.drain()
 
@@ -428,15 +1006,59 @@ class TProtocol:
     """
     Base class for thrift protocols, subclass should implement some of the protocol methods,
     currently we only have :class:`TBinaryProtocol` implemented for you.
+
+    :param trans: the transport to read from or write to
+    :param buffered: if True, incoming data is read in large chunks (or whole
+        frames with :class:`TFramedTransport`) and decoded from memory, instead of
+        awaiting the transport for every single value. Use it with
+        ``protocol_cls=functools.partial(TBinaryProtocol, buffered=True)``.
     """
 
+    #: max bytes read from the transport at once in buffered mode
+    read_size = 65536
+
     def __init__(
-        self, trans, strict_read=True, strict_write=True, decode_response=True
+        self,
+        trans,
+        strict_read=True,
+        strict_write=True,
+        decode_response=True,
+        buffered=False,
     ):
         self.trans = trans
         self.strict_read = strict_read
         self.strict_write = strict_write
         self.decode_response = decode_response
+        self.buffered = buffered
+        self._rbuf = b""
+        self._rpos = 0
+        self._wbuf = None
+
+    async def _read_more(self):
+        """Append the next chunk of data from the transport to the read buffer."""
+        if isinstance(self.trans, TFramedTransport):
+            data = await self.trans.read()
+        else:
+            data = await self.trans.read(self.read_size)
+        if not data:
+            pos = self._rpos
+            raise asyncio.IncompleteReadError(bytes(self._rbuf[pos:]), None)
+
+        if self._rbuf:
+            if not isinstance(self._rbuf, bytearray):
+                self._rbuf = bytearray(self._rbuf)
+            self._rbuf += data
+        else:
+            self._rbuf = data
+
+    def _discard_read(self):
+        """Drop the consumed part of the read buffer, keep any read-ahead data."""
+        pos = self._rpos
+        if pos >= len(self._rbuf):
+            self._rbuf = b""
+        else:
+            self._rbuf = self._rbuf[pos:]
+        self._rpos = 0
 
     def skip(self, ttype):
         pass
@@ -464,20 +1086,73 @@ class TBinaryProtocol(TProtocol):
     """Binary implementation of the Thrift protocol driver."""
 
     async def skip(self, ttype):
+        if self.buffered:
+            await self._fill(ttype)
+            self._rpos = skip_val(self._rbuf, self._rpos, ttype)
+            return
         await skip(self.trans, ttype)
 
     async def read_message_begin(self):
+        if self.buffered:
+            while True:
+                try:
+                    with memoryview(self._rbuf) as view:
+                        header, self._rpos = decode_message_begin(
+                            view, self._rpos, strict=self.strict_read
+                        )
+                    return header
+                except _UNDERFLOW_ERRORS:
+                    await self._read_more()
+
         api, ttype, seqid = await read_message_begin(
             self.trans, strict=self.strict_read
         )
         return api, ttype, seqid
 
+    async def read_message_end(self):
+        if self.buffered:
+            self._discard_read()
+
     def write_message_begin(self, name, ttype, seqid):
-        write_message_begin(self.trans, name, ttype, seqid, strict=self.strict_write)
+        # the message is built up in memory and handed to the transport at once
+        # by write_message_end.
+        self._wbuf = pack_message_begin(name, ttype, seqid, strict=self.strict_write)
+
+    def write_message_end(self):
+        # a fresh buffer is used for every message, since the transport may keep a
+        # reference to the data it couldn't send right away.
+        buf, self._wbuf = self._wbuf, None
+        self.trans.write(buf)
 
     async def read_struct(self, obj):
+        if self.buffered:
+            try:
+                self._decode_struct(obj)
+            except _UNDERFLOW_ERRORS:
+                # make sure the whole struct is buffered before decoding again,
+                # finding its end is much cheaper than decoding it over and over
+                await self._fill(TType.STRUCT)
+                self._decode_struct(obj)
+            return
+
         data = await read_struct(self.trans, obj, self.decode_response)
         return data
 
+    def _decode_struct(self, obj):
+        with memoryview(self._rbuf) as view:
+            self._rpos = decode_struct(view, self._rpos, obj, self.decode_response)
+
+    async def _fill(self, ttype):
+        """Read until the value of type `ttype` at the read position is buffered."""
+        scanner = ValueScanner(self._rpos, ttype)
+        while not scanner.scan(self._rbuf):
+            await self._read_more()
+
     def write_struct(self, obj):
-        write_val(self.trans, TType.STRUCT, obj)
+        if self._wbuf is not None:
+            get_codec(obj.__class__).encode(self._wbuf, obj)
+            return
+
+        out = bytearray()
+        get_codec(obj.__class__).encode(out, obj)
+        self.trans.write(out)
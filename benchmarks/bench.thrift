@@ -0,0 +1,13 @@
+struct Small {
+    1: i32 id,
+    2: string name,
+    3: bool active,
+    4: double score,
+}
+
+struct Large {
+    1: list<Small> items,
+    2: map<string, i64> counters,
+    3: list<i32> values,
+    4: binary blob,
+}
@@ -0,0 +1,131 @@
+"""
+Microbenchmark of the binary codec::
+
+    $ poetry run python benchmarks/codec.py --seconds 2
+
+It reports encoding and decoding throughput for a small and a large struct.
+`generic` encoding goes through the `write_val` helpers, which issue a
+transport write per value as every message used to, `protocol` is
+:class:`TBinaryProtocol` building the message in memory and writing it once.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import thriftpy2
+from thriftpy2.thrift import TMessageType
+from thriftpy2.thrift import TType
+
+from aiothrift.protocol import TBinaryProtocol
+from aiothrift.protocol import write_message_begin
+from aiothrift.protocol import write_val
+
+bench_thrift = thriftpy2.load(
+    os.path.join(os.path.dirname(__file__), "bench.thrift"), module_name="bench_thrift"
+)
+
+
+def payloads():
+    small = bench_thrift.Small(id=1, name="small", active=True, score=1.5)
+    large = bench_thrift.Large(
+        items=[
+            bench_thrift.Small(id=i, name="item-%d" % i, active=bool(i % 2), score=i)
+            for i in range(1000)
+        ],
+        counters={"counter-%d" % i: i for i in range(1000)},
+        values=list(range(1000)),
+        blob=b"x" * 4096,
+    )
+    return {"small": small, "large": large}
+
+
+class NullWriter:
+    def __init__(self):
+        self.nbytes = 0
+        self.writes = 0
+
+    def write(self, data):
+        self.nbytes += len(data)
+        self.writes += 1
+
+
+class BufferWriter:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+
+
+def encode_generic(writer, obj):
+    write_message_begin(writer, "echo", TMessageType.REPLY, 1)
+    write_val(writer, TType.STRUCT, obj)
+
+
+def encode_protocol(proto, obj):
+    proto.write_message_begin("echo", TMessageType.REPLY, 1)
+    proto.write_struct(obj)
+    proto.write_message_end()
+
+
+def bench_encode(obj, seconds):
+    results = {}
+    for name in ("generic", "protocol"):
+        writer = NullWriter()
+        proto = TBinaryProtocol(writer)
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            if name == "generic":
+                encode_generic(writer, obj)
+            else:
+                encode_protocol(proto, obj)
+            count += 1
+        elapsed = time.perf_counter() - start
+        results[name] = (writer.nbytes / elapsed, writer.writes / count)
+    return results
+
+
+async def bench_decode(obj, seconds):
+    writer = BufferWriter()
+    encode_protocol(TBinaryProtocol(writer), obj)
+    data = bytes(writer.data)
+
+    results = {}
+    for buffered in (False, True):
+        nbytes = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            proto = TBinaryProtocol(reader, buffered=buffered)
+            await proto.read_message_begin()
+            await proto.read_struct(type(obj)())
+            await proto.read_message_end()
+            nbytes += len(data)
+        elapsed = time.perf_counter() - start
+        results["buffered" if buffered else "awaited"] = nbytes / elapsed
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="time per case")
+    args = parser.parse_args()
+
+    for shape, obj in payloads().items():
+        for name, (rate, writes) in bench_encode(obj, args.seconds).items():
+            print(
+                f"encode {shape:6} {name:9} {rate / 1e6:8.2f} MB/s "
+                f"{writes:8.0f} writes/msg"
+            )
+        decoded = asyncio.run(bench_decode(obj, args.seconds))
+        for name, rate in decoded.items():
+            print(f"decode {shape:6} {name:9} {rate / 1e6:8.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -62,6 +62,37 @@ def server(request):
     return proc
 
 
+class Dispatcher:
+    def ping(self):
+        return "pong"
+
+    async def add(self, a, b):
+        await asyncio.sleep(0)
+        return a + b
+
+    def address(self, name):
+        return "address " + name
+
+
+@pytest_asyncio.fixture
+async def start_server(test_thrift):
+    """Start an in-process server on a free port, return its address."""
+    servers = []
+
+    async def f(handler=None, **kwargs):
+        server = await aiothrift.create_server(
+            test_thrift.Test, handler or Dispatcher(), ("127.0.0.1", 0), **kwargs
+        )
+        servers.append(server)
+        return server.sockets[0].getsockname()[:2]
+
+    yield f
+
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+
+
 @pytest_asyncio.fixture
 async def pool(test_thrift, create_pool, server):
     pool = await create_pool(test_thrift.Test, server.address)
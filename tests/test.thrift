@@ -1,3 +1,20 @@
+struct Item {
+    1: i32 id,
+    2: string name,
+    3: optional binary data,
+    4: optional list<double> scores,
+}
+
+struct Bundle {
+    1: i64 key,
+    2: bool flag,
+    3: byte tiny,
+    4: i16 small,
+    5: list<Item> items,
+    6: map<string, Item> index,
+    7: set<i32> tags,
+    8: optional Item head,
+}
 
 service Test {
     string ping(),
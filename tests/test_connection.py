@@ -1,5 +1,9 @@
+import asyncio
+
 import pytest
 
+from aiothrift import ConnectionClosedError
+
 
 @pytest.mark.asyncio
 async def test_connect_tcp(test_thrift, create_connection, server):
@@ -25,3 +29,31 @@ async def test_conflict_function_name(test_thrift, create_connection, server):
     assert conn.closed is False
     result = await conn.execute("address", "moon")
     assert result == "address moon"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("framed", [False, True])
+async def test_pipelined(test_thrift, create_connection, start_server, framed):
+    address = await start_server(framed=framed)
+    conn = await create_connection(
+        test_thrift.Test, address, timeout=5, pipelined=True, framed=framed
+    )
+    results = await asyncio.gather(*(conn.add(i, i) for i in range(100)))
+    assert results == [2 * i for i in range(100)]
+    assert await conn.ping() == "pong"
+    conn.close()
+    await conn.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_pipelined_close(test_thrift, create_connection, server):
+    conn = await create_connection(test_thrift.Test, server.address, pipelined=True)
+    calls = [asyncio.ensure_future(conn.add(i, i)) for i in range(10)]
+    await asyncio.sleep(0)
+    conn.close()
+    for call in calls:
+        with pytest.raises(ConnectionClosedError):
+            await call
+    await conn.wait_closed()
+    with pytest.raises(ConnectionClosedError):
+        await conn.ping()
@@ -0,0 +1,172 @@
+import asyncio
+import functools
+
+import pytest
+from thriftpy2.thrift import TType
+
+from aiothrift.protocol import get_codec
+from aiothrift.protocol import TBinaryProtocol
+from aiothrift.protocol import TFramedTransport
+from aiothrift.protocol import write_val
+
+
+class BytesWriter:
+    def __init__(self):
+        self.data = bytearray()
+        self.writes = 0
+
+    def write(self, data):
+        self.data += data
+        self.writes += 1
+
+    async def drain(self):
+        pass
+
+
+def make_bundle(test_thrift, n=3):
+    Item = test_thrift.Item
+    items = [
+        Item(
+            id=i,
+            name="item-%d" % i,
+            data=b"\xff\x00" * i,
+            scores=[i / 2, -1.5],
+        )
+        for i in range(n)
+    ]
+    return test_thrift.Bundle(
+        key=2**40,
+        flag=True,
+        tiny=-3,
+        small=1024,
+        items=items,
+        index={item.name: item for item in items},
+        tags={1, 2, 3},
+        head=Item(id=-1, name="héad"),
+    )
+
+
+def encode_message(obj, framed=False):
+    writer = BytesWriter()
+    trans = TFramedTransport(writer) if framed else writer
+    proto = TBinaryProtocol(trans)
+    proto.write_message_begin("echo", 2, 7)
+    proto.write_struct(obj)
+    proto.write_message_end()
+    return writer, trans
+
+
+def chunked_reader(data, chunk_size):
+    reader = asyncio.StreamReader()
+    for start in range(0, len(data), chunk_size):
+        end = start + chunk_size
+        reader.feed_data(bytes(data[start:end]))
+    reader.feed_eof()
+    return reader
+
+
+async def decode_message(proto, cls):
+    header = await proto.read_message_begin()
+    obj = cls()
+    await proto.read_struct(obj)
+    await proto.read_message_end()
+    return header, obj
+
+
+def normalize(bundle):
+    # sets are read back as lists
+    bundle.tags = set(bundle.tags)
+    return bundle
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("buffered", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+async def test_binary_roundtrip(test_thrift, buffered, chunk_size):
+    bundle = make_bundle(test_thrift, n=50)
+    writer, _ = encode_message(bundle)
+    # two messages back to back, the second must survive read-ahead
+    data = bytes(writer.data) * 2
+    proto = TBinaryProtocol(chunked_reader(data, chunk_size), buffered=buffered)
+
+    for _ in range(2):
+        header, obj = await decode_message(proto, test_thrift.Bundle)
+        assert header == ("echo", 2, 7)
+        assert normalize(obj) == bundle
+
+    with pytest.raises(asyncio.IncompleteReadError):
+        await proto.read_message_begin()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("buffered", [False, True])
+async def test_binary_framed_roundtrip(test_thrift, buffered):
+    bundle = make_bundle(test_thrift)
+    writer, trans = encode_message(bundle, framed=True)
+    await trans.drain()
+    reader = TFramedTransport(chunked_reader(bytes(writer.data) * 2, 5))
+    proto = TBinaryProtocol(reader, buffered=buffered)
+
+    for _ in range(2):
+        header, obj = await decode_message(proto, test_thrift.Bundle)
+        assert header == ("echo", 2, 7)
+        assert normalize(obj) == bundle
+
+
+@pytest.mark.asyncio
+async def test_buffered_skip_unknown_fields(test_thrift):
+    bundle = make_bundle(test_thrift)
+    writer, _ = encode_message(bundle)
+    proto = TBinaryProtocol(chunked_reader(writer.data, 3), buffered=True)
+
+    header, item = await decode_message(proto, test_thrift.Item)
+    # Bundle and Item only share field ids of different types, all are skipped
+    assert header == ("echo", 2, 7)
+    assert item == test_thrift.Item()
+
+
+@pytest.mark.asyncio
+async def test_buffered_connection(test_thrift, create_connection, server):
+    conn = await create_connection(
+        test_thrift.Test,
+        server.address,
+        protocol_cls=functools.partial(TBinaryProtocol, buffered=True),
+        timeout=5,
+    )
+    assert await conn.ping() == "pong"
+    assert await conn.add(1, 2) == 3
+    assert await conn.execute("address", "moon") == "address moon"
+    conn.close()
+
+
+def test_codec_is_cached(test_thrift):
+    codec = get_codec(test_thrift.Bundle)
+    assert get_codec(test_thrift.Bundle) is codec
+    assert codec.fields[5] == (TType.LIST, "items", (TType.STRUCT, test_thrift.Item))
+
+
+def test_codec_matches_generic_encoder(test_thrift):
+    bundle = make_bundle(test_thrift)
+    expected = BytesWriter()
+    write_val(expected, TType.STRUCT, bundle)
+
+    out = bytearray()
+    get_codec(test_thrift.Bundle).encode(out, bundle)
+    assert out == expected.data
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strict", [False, True])
+async def test_message_written_at_once(test_thrift, strict):
+    bundle = make_bundle(test_thrift)
+    writer = BytesWriter()
+    proto = TBinaryProtocol(writer, strict_read=strict, strict_write=strict)
+    proto.write_message_begin("echo", 2, 7)
+    proto.write_struct(bundle)
+    proto.write_message_end()
+    assert writer.writes == 1
+
+    reader = TBinaryProtocol(chunked_reader(writer.data, 11), strict_read=strict)
+    header, obj = await decode_message(reader, test_thrift.Bundle)
+    assert header == ("echo", 2, 7)
+    assert normalize(obj) == bundle